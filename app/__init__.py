@@ -8,13 +8,15 @@ from flask import Flask
 from core.config import (
     SSH_USERNAME, SSH_KEY_PATH, SSH_CONTROL_PATH_TEMPLATE,
     NLNOG_API, NLNOG_PARTICIPANTS_API, NLNOG_API_TIMEOUT,
-    SSH_CONNECT_TIMEOUT, SSH_SUBPROCESS_TIMEOUT,
-    PING_COUNT, PING_TIMEOUT, STARTUP_MAX_WORKERS,
+    SSH_CONNECT_TIMEOUT, SSH_SUBPROCESS_TIMEOUT, SSH_CONNECT_RATE, SSH_HEALTHY_CHECK_INTERVAL,
+    SSH_MASTER_MAX_AGE,
+    PING_COUNT, PING_TIMEOUT, PING_BACKEND, STARTUP_MAX_WORKERS,
     THREADS, CACHE_REFRESH_INTERVAL, LOG_LEVEL, DEBUG,
     FLASK_HOST, FLASK_PORT,
 )
 from core.session_manager import SSHSessionManager
 from core.node_manager import NodeManager
+from core.ssh_pool import AsyncSSHPool
 
 
 def _validate_ssh_key():
@@ -75,8 +77,12 @@ def _startup_banner():
     logging.info("  SSH connect timeout:  %ds", SSH_CONNECT_TIMEOUT)
     logging.info("  SSH command timeout:  %ds", SSH_SUBPROCESS_TIMEOUT)
     logging.info("  SSH control path:     %s", SSH_CONTROL_PATH_TEMPLATE)
+    logging.info("  SSH connect rate:     %g/s", SSH_CONNECT_RATE)
+    logging.info("  SSH health interval:  %ds", SSH_HEALTHY_CHECK_INTERVAL)
+    logging.info("  SSH master max age:   %s", f"{SSH_MASTER_MAX_AGE}s" if SSH_MASTER_MAX_AGE else "disabled")
     logging.info("  Ping count/timeout:   %d / %ds", PING_COUNT, PING_TIMEOUT)
-    logging.info("  Startup max workers:  %d", STARTUP_MAX_WORKERS)
+    logging.info("  Ping backend:         %s", PING_BACKEND)
+    logging.info("  Startup max workers:  %s", STARTUP_MAX_WORKERS or "auto")
     logging.info("  Worker threads:       %d", THREADS)
     logging.info("  Cache refresh:        %ds", CACHE_REFRESH_INTERVAL)
     logging.info("  Log level:            %s", LOG_LEVEL)
@@ -111,10 +117,12 @@ def create_app():
         username=SSH_USERNAME,
         key_path=SSH_KEY_PATH,
     )
-    node_manager = NodeManager(ssh_sessions)
+    ssh_pool = AsyncSSHPool(limiter=ssh_sessions.limiter) if PING_BACKEND == "asyncssh" else None
+    node_manager = NodeManager(ssh_sessions, ssh_pool)
 
     # Store on app for route access
     flask_app.config["node_manager"] = node_manager
+    flask_app.config["ssh_pool"] = ssh_pool
 
     # Register routes
     from app.routes import bp
@@ -1,12 +1,13 @@
 import logging
+import asyncio
 import traceback
-import concurrent.futures
+from operator import itemgetter
 
 from flask import Blueprint, request, Response, jsonify, current_app, render_template
 from prometheus_client import Gauge, generate_latest, CollectorRegistry
 
 from core.config import THREADS, DEBUG
-from core.ping import is_valid_target, ping_from_node
+from core.ping import is_valid_target, ping_nodes_async
 from core.node_manager import NODE_FILTER_FIELDS, _node_field_value
 from core.geo import get_country_name
 
@@ -17,6 +18,27 @@ def _get_manager():
     return current_app.config["node_manager"]
 
 
+def _country_name(node):
+    # Nodes restored from an older persisted cache may predate "country_name"
+    return node.get("country_name") or get_country_name(node["countrycode"])
+
+
+class _SingleMetric:
+    """Registry stand-in exposing one collected metric family."""
+
+    def __init__(self, metric):
+        self._metric = metric
+
+    def collect(self):
+        return [self._metric]
+
+
+def _stream_metrics(registry):
+    """Yield the exposition text one metric family at a time."""
+    for metric in registry.collect():
+        yield generate_latest(_SingleMetric(metric))
+
+
 @bp.route('/')
 def index():
     return render_template('index.html', filter_fields=list(NODE_FILTER_FIELDS))
@@ -72,79 +94,64 @@ def probe():
 
     json_results = []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS) as executor:
-        futures = {
-            executor.submit(ping_from_node, node["hostname"], target): node
-            for node in nodes
-        }
-        for future in concurrent.futures.as_completed(futures):
-            node_info = futures[future]
-            node = node_info["hostname"]
-            asn = node_info["asn"]
-            city = node_info["city"]
-            country = node_info["countrycode"]
-            continent = node_info["continent"]
-            company = node_info.get("company", "Unknown")
-            node_short = node.split('.')[0]
-
-            try:
-                _, status, stats = future.result()
-            except Exception as e:
-                logging.error(f"Error in future for node {node}: {e}")
-                if DEBUG:
-                    traceback.print_exc()
-                status = "future_error"
-                stats = None
-
-            label_kwargs = {
-                "node": node_short,
-                "target": target,
-                "asn": asn,
-                "city": city,
-                "countrycode": country,
+    # Fan out concurrently; at most THREADS pings are in flight at once
+    hostnames = [n["hostname"] for n in nodes]
+    ssh_pool = current_app.config["ssh_pool"]
+    if ssh_pool is not None:
+        outcomes = ssh_pool.ping_nodes(hostnames, target, THREADS)
+    else:
+        outcomes = asyncio.run(ping_nodes_async(hostnames, target, THREADS))
+    for node_info, outcome in zip(nodes, outcomes):
+        node = node_info["hostname"]
+        asn = node_info["asn"]
+        city = node_info["city"]
+        country = node_info["countrycode"]
+        continent = node_info["continent"]
+        company = node_info.get("company", "Unknown")
+        node_short = _node_field_value(node_info, "node")
+
+        if isinstance(outcome, BaseException):
+            logging.error(f"Error in future for node {node}: {outcome}")
+            if DEBUG:
+                traceback.print_exception(outcome)
+            status = "future_error"
+            stats = None
+        else:
+            _, status, stats = outcome
+
+        # Positional label values, in the same order as `labels`
+        label_values = (node_short, target, asn, city, country, status, continent, company)
+        success.labels(*label_values).set(1 if status == "ok" else 0)
+        if status == "ok":
+            rtt_min.labels(*label_values).set(stats["min"])
+            rtt_avg.labels(*label_values).set(stats["avg"])
+            rtt_max.labels(*label_values).set(stats["max"])
+            rtt_mdev.labels(*label_values).set(stats["mdev"])
+
+        with manager.last_node_status_lock:
+            manager.last_node_status[node_short] = {
                 "status": status,
+                "city": city,
+                "cc": country,
+                "asn": asn,
                 "continent": continent,
                 "company": company,
             }
 
-            success.labels(**label_kwargs).set(1 if status == "ok" else 0)
-            if status == "ok":
-                rtt_min.labels(**label_kwargs).set(stats["min"])
-                rtt_avg.labels(**label_kwargs).set(stats["avg"])
-                rtt_max.labels(**label_kwargs).set(stats["max"])
-                rtt_mdev.labels(**label_kwargs).set(stats["mdev"])
-
-            with manager.last_node_status_lock:
-                manager.last_node_status[node_short] = {
-                    "status": status,
-                    "city": city,
-                    "cc": country,
-                    "asn": asn,
-                    "continent": continent,
-                    "company": company,
-                }
-
-            if output_format == 'json':
-                result = {
-                    "node": node_short,
-                    "target": target,
-                    "asn": asn,
-                    "city": city,
-                    "countrycode": country,
-                    "continent": continent,
-                    "company": company,
-                    "status": status,
-                    "rtt_min": stats["min"] if stats else None,
-                    "rtt_avg": stats["avg"] if stats else None,
-                    "rtt_max": stats["max"] if stats else None,
-                    "rtt_mdev": stats["mdev"] if stats else None,
-                }
-                json_results.append(result)
+        if output_format == 'json':
+            result = dict(
+                zip(labels, label_values),
+                rtt_min=stats["min"] if stats else None,
+                rtt_avg=stats["avg"] if stats else None,
+                rtt_max=stats["max"] if stats else None,
+                rtt_mdev=stats["mdev"] if stats else None,
+            )
+            json_results.append(result)
 
     if output_format == 'json':
         return jsonify({"results": json_results})
 
-    return Response(generate_latest(registry), mimetype="text/plain")
+    return Response(_stream_metrics(registry), mimetype="text/plain")
 
 
 @bp.route('/api/filter-options')
@@ -153,14 +160,18 @@ def filter_options():
     nodes = manager.fetch_healthy_nodes()
 
     options = {field: set() for field in NODE_FILTER_FIELDS}
+    country_names = {}
     for node in nodes:
         for field in NODE_FILTER_FIELDS:
             val = _node_field_value(node, field)
             if val:
                 options[field].add(val)
+        cc = node["countrycode"]
+        if cc and cc not in country_names:
+            country_names[cc] = _country_name(node)
 
     result = {field: sorted(vals) for field, vals in options.items()}
-    result["countryNames"] = {cc: get_country_name(cc) for cc in options.get("countrycode", set())}
+    result["countryNames"] = country_names
     return jsonify(result)
 
 
@@ -221,13 +232,13 @@ def debug_view():
 
     lines = []
     for status in sorted_statuses:
-        lines.append(f"=== {status} ({len(grouped[status])}) ===")
-        for hostname, info in sorted(grouped[status], key=lambda x: x[0]):
-            short = hostname.split('.')[0]
-            lines.append(
-                f"{short:30} [{info.get('company', 'Unknown')}, {info['city']}, "
-                f"{get_country_name(info['countrycode'])}, ASN {info['asn']}, {info['continent']}]"
-            )
+        group = grouped[status]
+        lines.append(f"=== {status} ({len(group)}) ===")
+        lines.extend(
+            f"{_node_field_value(info, 'node'):30} [{info.get('company', 'Unknown')}, {info['city']}, "
+            f"{_country_name(info)}, ASN {info['asn']}, {info['continent']}]"
+            for _, info in sorted(group, key=itemgetter(0))
+        )
         lines.append("")
 
     return Response("\n".join(lines), mimetype="text/plain")
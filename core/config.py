@@ -19,13 +19,23 @@ SSH_CONNECT_TIMEOUT = int(os.getenv("SSH_CONNECT_TIMEOUT", "5"))
 SSH_SUBPROCESS_TIMEOUT = int(os.getenv("SSH_SUBPROCESS_TIMEOUT", "15"))
 SSH_KEY_PATH = os.getenv("SSH_KEY_PATH", "/app/ssh/nlnog")
 SSH_CONTROL_PATH_TEMPLATE = os.getenv("SSH_CONTROL_PATH_TEMPLATE", "/tmp/ssh-control/nlnog-%r@%h:%p")
+# Maximum new SSH master connections per second (0 disables the limit)
+SSH_CONNECT_RATE = float(os.getenv("SSH_CONNECT_RATE", "20"))
+# Healthy sessions are re-checked at most this often; unhealthy ones every refresh
+SSH_HEALTHY_CHECK_INTERVAL = int(os.getenv("SSH_HEALTHY_CHECK_INTERVAL", "900"))
+# Masters older than about this are restarted, a few per refresh (0 disables recycling)
+SSH_MASTER_MAX_AGE = int(os.getenv("SSH_MASTER_MAX_AGE", "86400"))
 
 # Ping settings
 PING_COUNT = int(os.getenv("PING_COUNT", "10"))
 PING_TIMEOUT = int(os.getenv("PING_TIMEOUT", "5"))
+# "openssh" (ssh client via ControlMaster sockets) or "asyncssh" (in-process connections)
+PING_BACKEND = os.getenv("PING_BACKEND", "openssh").lower()
 
 # Startup settings
-STARTUP_MAX_WORKERS = int(os.getenv("STARTUP_MAX_WORKERS", "50"))
+# Unset or <= 0 means size to the host: min(max(32, CPUs * 5), sessions to start)
+_startup_max_workers = int(os.getenv("STARTUP_MAX_WORKERS") or 0)
+STARTUP_MAX_WORKERS = _startup_max_workers if _startup_max_workers > 0 else None
 
 # Application settings
 THREADS = int(os.getenv("THREADS", "100"))
@@ -1,3 +1,5 @@
+import functools
+
 import country_converter as coco
 
 _cc = coco.CountryConverter()
@@ -5,6 +7,18 @@ _cc = coco.CountryConverter()
 
 def get_continent(alpha2: str) -> str:
     """Return the continent name for an ISO alpha-2 country code, or 'Unknown'."""
+    return _continent(alpha2.strip().upper())
+
+
+def get_country_name(alpha2: str) -> str:
+    """Return the short country name for an ISO alpha-2 code, or the code itself."""
+    return _country_name(alpha2.strip().upper())
+
+
+# coco lookups are slow; inputs are a small bounded set of alpha-2 codes,
+# so memoize the normalized results for the life of the process.
+@functools.lru_cache(maxsize=None)
+def _continent(alpha2: str) -> str:
     result = _cc.convert(alpha2, src="ISO2", to="continent")
     if result == "not found":
         return "Unknown"
@@ -16,7 +30,7 @@ def get_continent(alpha2: str) -> str:
     return result
 
 
-def get_country_name(alpha2: str) -> str:
-    """Return the short country name for an ISO alpha-2 code, or the code itself."""
+@functools.lru_cache(maxsize=None)
+def _country_name(alpha2: str) -> str:
     result = _cc.convert(alpha2, src="ISO2", to="name_short")
     return result if result != "not found" else alpha2
@@ -1,7 +1,7 @@
-import json
 import os
 import logging
-import tempfile
+
+import orjson
 
 _CACHE_PATH = "/tmp/ssh-control/node_cache.json"
 
@@ -9,16 +9,19 @@ _CACHE_PATH = "/tmp/ssh-control/node_cache.json"
 def save_node_cache(nodes):
     """Atomically persist the node list to disk."""
     try:
-        cache_dir = os.path.dirname(_CACHE_PATH)
-        os.makedirs(cache_dir, exist_ok=True)
-        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        # Per-process tmp name: old and new workers both write during a reload
+        tmp_path = f"{_CACHE_PATH}.{os.getpid()}.tmp"
         try:
-            with os.fdopen(fd, "w") as f:
-                json.dump(nodes, f)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(nodes))
             os.replace(tmp_path, _CACHE_PATH)
             logging.debug("Persisted node cache (%d nodes) to %s", len(nodes), _CACHE_PATH)
         except BaseException:
-            os.unlink(tmp_path)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
             raise
     except Exception as e:
         logging.warning("Failed to persist node cache: %s", e)
@@ -27,8 +30,8 @@ def save_node_cache(nodes):
 def load_node_cache():
     """Load the persisted node list from disk. Returns None on any error."""
     try:
-        with open(_CACHE_PATH, "r") as f:
-            nodes = json.load(f)
+        with open(_CACHE_PATH, "rb") as f:
+            nodes = orjson.loads(f.read())
         logging.info("Loaded persisted node cache (%d nodes) from %s", len(nodes), _CACHE_PATH)
         return nodes
     except Exception as e:
@@ -3,15 +3,19 @@ import logging
 import random
 import traceback
 import concurrent.futures
+from collections import defaultdict
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from core.config import (
     NLNOG_API, NLNOG_PARTICIPANTS_API, NLNOG_API_TIMEOUT,
     THREADS, CACHE_REFRESH_INTERVAL, STARTUP_MAX_WORKERS, DEBUG,
+    SSH_HEALTHY_CHECK_INTERVAL, SSH_MASTER_MAX_AGE,
     SSH_USERNAME, SSH_CONTROL_PATH_TEMPLATE, SSH_KEY_PATH,
     ssh_control_path,
 )
-from core.geo import get_continent
+from core.geo import get_continent, get_country_name
 from core.node_cache_store import save_node_cache, load_node_cache
 from core.session_manager import SSHSessionManager
 
@@ -33,7 +37,8 @@ NODE_FILTER_FIELDS = {
 def _node_field_value(node, field):
     """Get the value of a filter field from a node."""
     if field == "node":
-        return node["hostname"].split('.')[0]
+        # "short" is precomputed at ingestion; older persisted caches may lack it
+        return node.get("short") or node["hostname"].split('.', 1)[0]
     return node.get(NODE_FILTER_FIELDS[field]) or ""
 
 
@@ -51,11 +56,11 @@ def _balanced_sample(nodes, limit, filters):
     if not balance_fields:
         return random.sample(nodes, limit)
 
-    # Group nodes by their combined balance-field values
-    groups = {}
-    for node in nodes:
+    # Group node indices by their combined balance-field values
+    groups = defaultdict(list)
+    for i, node in enumerate(nodes):
         key = tuple(_node_field_value(node, f).lower() for f in balance_fields)
-        groups.setdefault(key, []).append(node)
+        groups[key].append(i)
 
     # Distribute quota evenly, then redistribute any shortfall
     group_keys = list(groups.keys())
@@ -67,28 +72,29 @@ def _balanced_sample(nodes, limit, filters):
         for i, key in enumerate(group_keys)
     }
 
-    result = []
+    chosen = []
     shortfall = 0
     for key in group_keys:
         group = groups[key]
         quota = quotas[key]
         take = min(quota, len(group))
-        result.extend(random.sample(group, take))
+        chosen.extend(random.sample(group, take))
         shortfall += quota - take
 
     # Fill shortfall from nodes not yet selected
     if shortfall > 0:
-        selected = {id(n) for n in result}
-        remaining = [n for n in nodes if id(n) not in selected]
+        selected = set(chosen)
+        remaining = [i for i in range(len(nodes)) if i not in selected]
         if remaining:
-            result.extend(random.sample(remaining, min(shortfall, len(remaining))))
+            chosen.extend(random.sample(remaining, min(shortfall, len(remaining))))
 
-    return result
+    return [nodes[i] for i in chosen]
 
 
 class NodeManager:
-    def __init__(self, ssh_sessions: SSHSessionManager):
+    def __init__(self, ssh_sessions: SSHSessionManager, ssh_pool=None):
         self.ssh_sessions = ssh_sessions
+        self.ssh_pool = ssh_pool
 
         # Shared state with individual locks
         self.node_cache = []
@@ -102,13 +108,19 @@ class NodeManager:
 
         self.shutdown_event = threading.Event()
 
+        # Persistent HTTP session so API polls reuse the TLS connection
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+
         self._startup_done = False
 
     def fetch_participants(self):
         """Fetch participant list from NLNOG API and return {id: company} map."""
         try:
-            response = requests.get(NLNOG_PARTICIPANTS_API, timeout=NLNOG_API_TIMEOUT)
-            participants = response.json()["results"]["participants"]
+            response = self._http.get(NLNOG_PARTICIPANTS_API, timeout=NLNOG_API_TIMEOUT)
+            participants = orjson.loads(response.content)["results"]["participants"]
             return {p["id"]: p["company"] for p in participants}
         except Exception as e:
             logging.warning("Failed to fetch participants: %s", e)
@@ -124,12 +136,15 @@ class NodeManager:
                 continue
             cc = n["countrycode"].upper()
             continent = get_continent(cc)
+            country_name = get_country_name(cc)
             company = participants.get(n.get("participant"), "Unknown")
             filtered.append({
                 "hostname": n["hostname"],
+                "short": n["hostname"].split('.', 1)[0],
                 "asn": str(n["asn"]),
                 "city": n["city"],
                 "countrycode": cc,
+                "country_name": country_name,
                 "continent": continent,
                 "company": company,
             })
@@ -147,8 +162,8 @@ class NodeManager:
         api_nodes = None
         try:
             participants = self.fetch_participants()
-            response = requests.get(NLNOG_API, timeout=NLNOG_API_TIMEOUT)
-            raw_nodes = response.json()["results"]["nodes"]
+            response = self._http.get(NLNOG_API, timeout=NLNOG_API_TIMEOUT)
+            raw_nodes = orjson.loads(response.content)["results"]["nodes"]
             api_nodes = self.filter_api_nodes(raw_nodes, participants)
             save_node_cache(api_nodes)
             logging.info("Fetched %d nodes from API during startup (%d participants loaded)", len(api_nodes), len(participants))
@@ -183,8 +198,7 @@ class NodeManager:
         logging.info("Startup restore complete: %d/%d sessions healthy", healthy_count, len(hostnames))
 
     def check_and_manage_ssh_session(self, hostname):
-        self.ssh_sessions.start_session(hostname)
-
+        # Check the existing master first; only (re)start it when the check fails
         control_path = ssh_control_path(hostname)
         result = subprocess.run([
             "ssh", "-O", "check",
@@ -192,15 +206,26 @@ class NodeManager:
             "-o", f"ControlPath={control_path}",
             "-l", SSH_USERNAME,
             hostname
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
         if result.returncode == 0:
             logging.debug(f"SSH session to {hostname} is healthy")
+            self.ssh_sessions.adopt_session(hostname)
             with self.session_health_lock:
                 self.session_health[hostname] = "healthy"
             return True
 
-        reason = result.stderr.strip() or f"exit code {result.returncode}"
+        # New node with no master yet -- a plain start is all that's needed,
+        # and a failed one is not retried until the next cycle
+        if not self.ssh_sessions.has_session(hostname):
+            started = self.ssh_sessions.start_session(hostname)
+            if started:
+                logging.debug(f"Started SSH session to new node {hostname}")
+            with self.session_health_lock:
+                self.session_health[hostname] = "healthy" if started else "error"
+            return started
+
+        reason = result.stderr.decode(errors="replace").strip() or f"exit code {result.returncode}"
         logging.warning(f"SSH health check failed for {hostname}: {reason} — restarting session")
         self.ssh_sessions.stop_session(hostname)
         self.ssh_sessions.start_session(hostname)
@@ -208,6 +233,43 @@ class NodeManager:
             self.session_health[hostname] = "restarted"
         return False
 
+    def _hosts_due_for_check(self, hostnames):
+        """Select hosts whose SSH session needs a full check this cycle.
+
+        Masters not verified within SSH_HEALTHY_CHECK_INTERVAL are first
+        probed through their control sockets, which drops dead ones. Only new
+        or unhealthy hosts, and hosts without a live master, are then due.
+        """
+        self.ssh_sessions.refresh_stale(ttl=SSH_HEALTHY_CHECK_INTERVAL)
+        with self.session_health_lock:
+            health = dict(self.session_health)
+
+        due = [
+            h for h in hostnames
+            if health.get(h) != "healthy" or not self.ssh_sessions.has_session(h)
+        ]
+
+        logging.debug("Checking %d/%d SSH sessions this cycle", len(due), len(hostnames))
+        return due
+
+    def _recycle_aged_sessions(self):
+        """Restart a small batch of masters older than SSH_MASTER_MAX_AGE."""
+        aged = self.ssh_sessions.aged_sessions(SSH_MASTER_MAX_AGE)
+        if not aged:
+            return
+
+        # Keep /probe off these hosts while their master is down; pings would
+        # otherwise fall back to a full SSH handshake each.
+        with self.session_health_lock:
+            for h in aged:
+                self.session_health[h] = "restarted"
+
+        logging.info("Recycling %d SSH sessions older than %ds", len(aged), SSH_MASTER_MAX_AGE)
+        for h in aged:
+            started = self.ssh_sessions.restart_session(h)
+            with self.session_health_lock:
+                self.session_health[h] = "healthy" if started else "error"
+
     def run_cache_loop(self):
         if not self._startup_done:
             self.startup_restore_sessions()
@@ -216,8 +278,8 @@ class NodeManager:
         while not self.shutdown_event.is_set():
             try:
                 participants = self.fetch_participants()
-                response = requests.get(NLNOG_API, timeout=NLNOG_API_TIMEOUT)
-                raw_nodes = response.json()["results"]["nodes"]
+                response = self._http.get(NLNOG_API, timeout=NLNOG_API_TIMEOUT)
+                raw_nodes = orjson.loads(response.content)["results"]["nodes"]
                 filtered = self.filter_api_nodes(raw_nodes, participants)
 
                 save_node_cache(filtered)
@@ -226,16 +288,22 @@ class NodeManager:
                     self.node_cache = filtered
 
                 hostnames = {n["hostname"] for n in filtered}
+
+                if SSH_MASTER_MAX_AGE:
+                    self._recycle_aged_sessions()
+
+                due = self._hosts_due_for_check(hostnames)
                 with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS) as executor:
-                    executor.map(self.check_and_manage_ssh_session, sorted(hostnames))
+                    executor.map(self.check_and_manage_ssh_session, due)
 
                 # Prune health entries and stop sessions for nodes no longer in cache
                 with self.session_health_lock:
                     stale = set(self.session_health.keys()) - hostnames
                     for h in stale:
                         del self.session_health[h]
-                for h in stale:
-                    self.ssh_sessions.stop_session(h)
+                self.ssh_sessions.stop_sessions_parallel(stale)
+                if self.ssh_pool is not None:
+                    self.ssh_pool.prune(hostnames)
 
                 with self.session_health_lock:
                     healthy_count = sum(1 for v in self.session_health.values() if v == "healthy")
@@ -249,14 +317,25 @@ class NodeManager:
             self.shutdown_event.wait(timeout=CACHE_REFRESH_INTERVAL)
 
     def fetch_healthy_nodes(self, limit=None, filters=None):
-        with self.cache_lock:
-            nodes = self.node_cache.copy()
-        with self.session_health_lock:
-            healthy = [n for n in nodes if self.session_health.get(n["hostname"]) == "healthy"]
+        # Filter in a single pass under both locks instead of copying the cache.
+        # Lock order: cache_lock, then session_health_lock.
+        with self.cache_lock, self.session_health_lock:
+            health = self.session_health
+            healthy = [n for n in self.node_cache if health.get(n["hostname"]) == "healthy"]
 
         if filters:
-            for field, allowed_values in filters.items():
-                healthy = [n for n in healthy if _node_field_value(n, field).lower() in allowed_values]
+            # Evaluate all predicates in one pass; "node" needs the short hostname,
+            # every other field is a plain dict lookup.
+            node_allowed = filters.get("node")
+            field_items = [
+                (NODE_FILTER_FIELDS[field], allowed)
+                for field, allowed in filters.items() if field != "node"
+            ]
+            healthy = [
+                n for n in healthy
+                if (node_allowed is None or _node_field_value(n, "node").lower() in node_allowed)
+                and all((n.get(key) or "").lower() in allowed for key, allowed in field_items)
+            ]
 
         if limit is not None and limit < len(healthy):
             if filters:
@@ -1,7 +1,10 @@
 import os
-import subprocess
+import re
+import asyncio
 import socket
 import logging
+import threading
+import time
 import traceback
 
 from core.config import (
@@ -9,16 +12,40 @@ from core.config import (
     SSH_USERNAME, PING_COUNT, PING_TIMEOUT, DEBUG, ssh_control_path,
 )
 
+# Matches the ping summary line, e.g. "rtt min/avg/max/mdev = 1.2/3.4/5.6/0.7 ms"
+_RTT_RE = re.compile(r'^rtt [^=]*=\s*([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+)', re.M)
+
+
+# Recently resolved targets -> expiry (monotonic). Prometheus scrapes the same
+# targets repeatedly, so skip the blocking getaddrinfo for a while.
+_TARGET_CACHE_TTL = 300
+_TARGET_CACHE_MAX = 1024
+_target_cache = {}
+_target_cache_lock = threading.Lock()
+
 
 def is_valid_target(host):
+    now = time.monotonic()
+    with _target_cache_lock:
+        expires = _target_cache.get(host)
+        if expires is not None and expires > now:
+            return True
+
     try:
         socket.getaddrinfo(host, None)
-        return True
     except socket.gaierror:
         return False
 
+    with _target_cache_lock:
+        if len(_target_cache) >= _TARGET_CACHE_MAX:
+            # Drop the oldest entry (dicts keep insertion order)
+            _target_cache.pop(next(iter(_target_cache)))
+        _target_cache.pop(host, None)
+        _target_cache[host] = now + _TARGET_CACHE_TTL
+    return True
+
 
-def ping_from_node(node, target):
+def _ping_command(node, target):
     control_path = ssh_control_path(node)
     ssh_cmd = [
         "ssh",
@@ -29,43 +56,74 @@ def ping_from_node(node, target):
         "-l", SSH_USERNAME,
     ]
 
-    ssh_cmd += ["-o", f"ControlPath={control_path}"]
+    # Reuse the managed master's socket but never create one: a probe-owned
+    # master would block SSHSessionManager from binding the path. When no
+    # master is up, detect a dead direct connection before the subprocess timeout.
+    ssh_cmd += [
+        "-o", f"ControlPath={control_path}",
+        "-o", "ServerAliveInterval=30",
+        "-o", "ServerAliveCountMax=3",
+    ]
     ssh_cmd += [node, f"ping -c{PING_COUNT} -W{PING_TIMEOUT} {target}"]
+    return ssh_cmd
+
+
+def _parse_ping_result(node, returncode, output):
+    logging.debug(f"Output from {node}:\n{output}")
+
+    # Non-zero exit (e.g. total packet loss) is common; handle it without raising
+    if returncode != 0:
+        logging.warning(f"Ping command failed on {node}: exit code {returncode}")
+        return node, "ping_error", None
+
+    m = _RTT_RE.search(output)
+    if m:
+        min_rtt, avg_rtt, max_rtt, mdev_rtt = map(float, m.groups())
+        return node, "ok", {
+            "min": min_rtt,
+            "avg": avg_rtt,
+            "max": max_rtt,
+            "mdev": mdev_rtt
+        }
+
+    logging.warning(f"No RTT output in ping from {node}")
+    return node, "no_rtt", None
+
+
+async def ping_from_node_async(node, target):
+    """Ping target from node over its SSH master; returns (node, status, stats)."""
+    ssh_cmd = _ping_command(node, target)
     logging.debug(f"Running SSH ping from {node} to {target}")
     try:
-        output = subprocess.check_output(
-            ssh_cmd, stderr=subprocess.STDOUT,
-            timeout=SSH_SUBPROCESS_TIMEOUT, text=True,
+        proc = await asyncio.create_subprocess_exec(
+            *ssh_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+            stdin=asyncio.subprocess.DEVNULL,
         )
-        logging.debug(f"Output from {node}:\n{output}")
-
-        if "rtt" in output:
-            rtt_line = next((l for l in output.splitlines() if l.startswith("rtt")), None)
-            if not rtt_line:
-                logging.warning(f"No RTT line found in output from {node}")
-                return node, "no_rtt", None
-            parts = rtt_line.split('=')[1].split()[0]
-            min_rtt, avg_rtt, max_rtt, mdev_rtt = map(float, parts.split('/'))
-            return node, "ok", {
-                "min": min_rtt,
-                "avg": avg_rtt,
-                "max": max_rtt,
-                "mdev": mdev_rtt
-            }
-
-        logging.warning(f"No RTT output in ping from {node}")
-        return node, "no_rtt", None
-
-    except subprocess.TimeoutExpired:
-        logging.warning(f"SSH to {node} timed out")
-        return node, "ssh_timeout", None
-    except subprocess.CalledProcessError as e:
-        logging.warning(f"Ping command failed on {node}: {e}")
-        if DEBUG:
-            logging.debug(e.output)
-        return node, "ping_error", None
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=SSH_SUBPROCESS_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logging.warning(f"SSH to {node} timed out")
+            return node, "ssh_timeout", None
+        return _parse_ping_result(node, proc.returncode, stdout.decode(errors="replace"))
+
     except Exception as e:
         logging.error(f"Error pinging from {node}: {e}")
         if DEBUG:
             traceback.print_exc()
         return node, "exception", None
+
+
+async def ping_nodes_async(nodes, target, concurrency):
+    """Ping target from every node, running at most `concurrency` at once.
+
+    Returns one result tuple (or raised exception) per node, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(node):
+        async with semaphore:
+            return await ping_from_node_async(node, target)
+
+    return await asyncio.gather(*(_bounded(n) for n in nodes), return_exceptions=True)
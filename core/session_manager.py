@@ -1,88 +1,432 @@
 import os
+import json
+import zlib
+import asyncio
+import functools
 import getpass
+import shutil
 import subprocess
 import threading
+import time
 import logging
-import concurrent.futures
-from typing import Set, Callable, Optional
+from typing import Dict, List, Set, Callable, Optional
 
-from core.config import SSH_CONNECT_TIMEOUT, SSH_CONTROL_PATH_TEMPLATE, ssh_control_path
+from core.config import SSH_CONNECT_TIMEOUT, SSH_CONNECT_RATE, SSH_CONTROL_PATH_TEMPLATE
 
-# Common SSH options applied to all SSH invocations (master, check, exit).
-_SSH_COMMON_OPTS = [
+# Resolve the ssh binary once so launches don't walk PATH on every execve.
+_SSH_BIN = shutil.which("ssh") or "/usr/bin/ssh"
+
+# Common SSH options applied to all SSH invocations (master, exit).
+_SSH_COMMON_OPTS = (
     "-o", "BatchMode=yes",
     "-o", "StrictHostKeyChecking=No",
     "-o", f"ConnectTimeout={SSH_CONNECT_TIMEOUT}",
-]
+)
+
+# Options for starting a persistent, backgrounded master.
+_SSH_MASTER_OPTS = (
+    "-MNf",
+    *_SSH_COMMON_OPTS,
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPersist=yes",
+)
+
+# Masters are recycled at most this many per call to aged_sessions(), with
+# per-host due times spread over the last quarter of the maximum age.
+_RECYCLE_BATCH = 10
+_RECYCLE_JITTER = 0.25
+
+# Maximum concurrent control-socket probes during stale-socket cleanup.
+_SOCKET_CHECK_CONCURRENCY = 50
+
+# OpenSSH mux protocol: a master greets every new control connection with
+# a MUX_MSG_HELLO packet (uint32 length, uint32 type, uint32 version).
+_MUX_MSG_HELLO = 0x00000001
+
+
+async def _is_master_alive(socket_path: str, timeout: float = 0.5) -> Optional[bool]:
+    """Probe the ControlMaster listening on socket_path.
+
+    Connects to the control socket directly instead of forking `ssh -O check`.
+    Returns True if the master sends its mux HELLO, False if it is certainly
+    dead (connection refused or the file is gone), and None if undetermined
+    (timeout or any other error) -- a busy master may just be slow to answer.
+    """
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(socket_path), timeout)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        header = await asyncio.wait_for(reader.readexactly(8), timeout)
+        if int.from_bytes(header[4:8], "big") == _MUX_MSG_HELLO:
+            return True
+        return None
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        return None
+    finally:
+        writer.close()
+
+
+@functools.lru_cache(maxsize=4096)
+def _control_path_cached(hostname: str, user: str, template: str) -> str:
+    """Expand a control path template; hosts are restarted often, so memoize."""
+    path = template.replace("%r", user).replace("%h", hostname).replace("%p", "22")
+    return os.path.expanduser(path)
+
+
+def _host_fraction(hostname: str) -> float:
+    """Stable pseudo-random value in [0, 1] for hostname."""
+    return zlib.crc32(hostname.encode()) / 0xFFFFFFFF
+
+
+def _snapshot_owner() -> Optional[str]:
+    """Identify the supervising process (e.g. the Gunicorn arbiter).
+
+    Masters survive a worker restart but not a restart of the supervisor or
+    container, so a session snapshot is only trusted under the same owner.
+    """
+    ppid = os.getppid()
+    try:
+        with open(f"/proc/{ppid}/stat") as f:
+            start_time = f.read().rpartition(")")[2].split()[19]
+    except (OSError, IndexError):
+        return None
+    return f"{ppid}:{start_time}"
+
+
+def _default_max_workers(count: int) -> int:
+    """Concurrency for bulk ssh launches: min(max(32, CPUs * 5), count)."""
+    return min(max(32, (os.cpu_count() or 1) * 5), count)
+
+
+class _RateLimiter:
+    """Token bucket limiting how quickly new SSH connections are opened.
+
+    After a failed connect the refill rate is halved for `backoff_seconds`,
+    easing pressure on remote sshd (MaxStartups) during outages.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, backoff_seconds: float = 30.0):
+        self.rate = rate
+        self.backoff_seconds = backoff_seconds
+        self._capacity = max(1.0, rate)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        self._backoff_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if available; otherwise return the seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rate / 2 if now < self._backoff_until else self.rate
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / rate
+
+    def acquire(self):
+        """Block until a connection may be opened."""
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        while delay > 0:
+            time.sleep(delay)
+            delay = self._reserve()
+
+    async def acquire_async(self):
+        """Asyncio counterpart of acquire()."""
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._reserve()
+
+    def backoff(self):
+        """Slow the refill rate after a failed connection attempt."""
+        with self._lock:
+            self._backoff_until = time.monotonic() + self.backoff_seconds
+
+
+def _ssh_error(stderr: bytes, returncode: int) -> str:
+    """Describe a failed ssh run; stderr is raw bytes, decoded only here."""
+    return stderr.decode(errors="replace").strip() or f"exit code {returncode}"
+
+
+class _Lazy:
+    """Log argument evaluated only if the record is actually emitted."""
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+
+    def __str__(self):
+        return self._func(*self._args)
+
+
+def _run_ssh(argv, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """Run an ssh command and return the completed process.
+
+    Only stderr is captured, as bytes (for error messages); stdout goes to /dev/null.
+    argv[0] is the absolute _SSH_BIN and no preexec_fn is used, which keeps
+    CPython on its vfork/posix_spawn fast path instead of a full fork.
+    """
+    with subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          close_fds=True, pass_fds=()) as proc:
+        try:
+            _, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+    return subprocess.CompletedProcess(argv, proc.returncode, None, stderr)
 
 
 class SSHSessionManager:
-    def __init__(self, control_path_template: str = SSH_CONTROL_PATH_TEMPLATE, username: str = None, key_path: str = None):
+    def __init__(self, control_path_template: str = SSH_CONTROL_PATH_TEMPLATE, username: str = None, key_path: str = None,
+                 connect_rate: float = SSH_CONNECT_RATE):
         self.control_path_template = control_path_template
-        self.username = username or os.getenv("SSH_USERNAME", getpass.getuser())
+        self.username = username or os.getenv("SSH_USERNAME") or getpass.getuser()
         self.key_path = os.path.expanduser(key_path) if key_path else None
-        self.active_sessions: Set[str] = set()
+        self._key_opts = ("-i", self.key_path) if self.key_path else ()
+        # hostname -> monotonic time the master was last known to be alive
+        self.active_sessions: Dict[str, float] = {}
+        # hostname -> monotonic time the current master was started (or first seen)
+        self._started_at: Dict[str, float] = {}
         self.lock = threading.RLock()
+        self._limiter = _RateLimiter(connect_rate)
+        self._snapshot_timer: Optional[threading.Timer] = None
+
+    @property
+    def limiter(self) -> _RateLimiter:
+        """Connect rate limiter, for other code that opens SSH connections."""
+        return self._limiter
 
     def _control_path(self, hostname: str) -> str:
-        return ssh_control_path(hostname)
+        return _control_path_cached(hostname, self.username, self.control_path_template)
 
-    def start_session(self, hostname: str) -> bool:
-        """Start an SSH master session. Returns True on success."""
+    def _control_dir(self) -> str:
+        # Derive the control directory from the template
+        sample_path = self.control_path_template.replace("%r", self.username).replace("%h", "x").replace("%p", "22")
+        return os.path.dirname(sample_path)
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self._control_dir(), "sessions.json")
+
+    def _schedule_snapshot(self):
+        """Persist active_sessions shortly, coalescing bursts of changes."""
+        with self.lock:
+            if self._snapshot_timer is not None:
+                return
+            self._snapshot_timer = threading.Timer(1.0, self._save_snapshot)
+            self._snapshot_timer.daemon = True
+            self._snapshot_timer.start()
+
+    def _save_snapshot(self):
+        """Write {hostname: control socket mtime_ns} for all active sessions."""
+        with self.lock:
+            if self._snapshot_timer is not None:
+                self._snapshot_timer.cancel()
+                self._snapshot_timer = None
+            hosts = list(self.active_sessions)
+
+        sessions = {}
+        for host in hosts:
+            try:
+                sessions[host] = os.stat(self._control_path(host)).st_mtime_ns
+            except OSError:
+                continue
+
+        path = self._snapshot_path()
+        # Unique per process and thread: workers overlap during a reload, and
+        # cleanup() can run while the debounce timer is writing.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"owner": _snapshot_owner(), "sessions": sessions}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.debug("Could not write session snapshot: %s", e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _load_snapshot(self) -> dict:
+        """Return the persisted {hostname: mtime_ns} map, or {} if untrusted."""
+        try:
+            with open(self._snapshot_path()) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        owner = _snapshot_owner()
+        if owner is None or data.get("owner") != owner:
+            return {}
+        return data.get("sessions", {})
+
+    def has_session(self, hostname: str) -> bool:
+        """Return True if a master session is tracked for hostname."""
+        with self.lock:
+            return hostname in self.active_sessions
+
+    def adopt_session(self, hostname: str):
+        """Track a master that is known to be alive (e.g. after a successful check)."""
+        with self.lock:
+            known = hostname in self.active_sessions
+            self.active_sessions[hostname] = now = time.monotonic()
+            if not known:
+                self._started_at[hostname] = now
+        if not known:
+            self._schedule_snapshot()
+
+    def _claim_session(self, hostname: str) -> bool:
+        """Mark hostname as started. Returns False if it is already tracked."""
         with self.lock:
             if hostname in self.active_sessions:
-                return True
+                return False
             # Optimistic add — prevents duplicate concurrent attempts
-            self.active_sessions.add(hostname)
+            self.active_sessions[hostname] = self._started_at[hostname] = time.monotonic()
+            return True
+
+    def _mark_verified(self, hostname: str):
+        with self.lock:
+            if hostname in self.active_sessions:
+                self.active_sessions[hostname] = time.monotonic()
+
+    def _master_cmd(self, hostname: str):
+        return (
+            _SSH_BIN, *_SSH_MASTER_OPTS,
+            "-o", f"ControlPath={self._control_path(hostname)}",
+            *self._key_opts,
+            f"{self.username}@{hostname}",
+        )
+
+    def _start_failed(self, hostname: str, reason):
+        logging.warning("SSH session start failed for %s: %s", hostname, reason)
+        self._limiter.backoff()
+        with self.lock:
+            self.active_sessions.pop(hostname, None)
+
+    def start_session(self, hostname: str) -> bool:
+        """Start an SSH master session. Returns True on success."""
+        if not self._claim_session(hostname):
+            return True
 
         # SSH subprocess runs outside the lock for true parallelism
         try:
-            logging.debug(f"Starting persistent SSH session to {hostname} as {self.username}")
-            cmd = [
-                "ssh", "-MNf",
-                *_SSH_COMMON_OPTS,
-                "-o", "ControlMaster=auto",
-                "-o", f"ControlPath={self._control_path(hostname)}",
-                "-o", "ControlPersist=yes",
-            ]
-            if self.key_path:
-                cmd += ["-i", self.key_path]
-            cmd.append(f"{self.username}@{hostname}")
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            self._limiter.acquire()
+            logging.debug("Starting persistent SSH session to %s as %s", hostname, self.username)
+            result = _run_ssh(self._master_cmd(hostname))
             if result.returncode != 0:
-                reason = result.stderr.strip() or f"exit code {result.returncode}"
-                logging.warning(f"SSH session start failed for {hostname}: {reason}")
-                with self.lock:
-                    self.active_sessions.discard(hostname)
+                self._start_failed(hostname, _Lazy(_ssh_error, result.stderr, result.returncode))
+                return False
+            self._mark_verified(hostname)
+            self._schedule_snapshot()
+            return True
+        except Exception as e:
+            logging.warning("SSH session start error for %s: %s", hostname, e)
+            with self.lock:
+                self.active_sessions.pop(hostname, None)
+            return False
+
+    async def _start_session_async(self, hostname: str, semaphore: asyncio.Semaphore) -> bool:
+        """Asyncio counterpart of start_session, bounded by semaphore."""
+        if not self._claim_session(hostname):
+            return True
+
+        try:
+            async with semaphore:
+                await self._limiter.acquire_async()
+                logging.debug("Starting persistent SSH session to %s as %s", hostname, self.username)
+                proc = await asyncio.create_subprocess_exec(
+                    *self._master_cmd(hostname),
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                )
+                _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                self._start_failed(hostname, _Lazy(_ssh_error, stderr, proc.returncode))
                 return False
+            self._mark_verified(hostname)
+            self._schedule_snapshot()
             return True
         except Exception as e:
-            logging.warning(f"SSH session start error for {hostname}: {e}")
+            logging.warning("SSH session start error for %s: %s", hostname, e)
             with self.lock:
-                self.active_sessions.discard(hostname)
+                self.active_sessions.pop(hostname, None)
             return False
 
     def stop_session(self, hostname: str):
         """Stop an SSH master session."""
         with self.lock:
-            if hostname not in self.active_sessions:
+            if self.active_sessions.pop(hostname, None) is None:
                 return
-            self.active_sessions.discard(hostname)
+        self._schedule_snapshot()
 
         # SSH exit runs outside the lock
+        self._exit_master(hostname)
+
+    def _exit_cmd(self, hostname: str):
+        return (
+            _SSH_BIN, "-O", "exit", *_SSH_COMMON_OPTS,
+            "-o", f"ControlPath={self._control_path(hostname)}",
+            f"{self.username}@{hostname}",
+        )
+
+    def _exit_master(self, hostname: str):
+        """Ask the master for hostname to exit (no session bookkeeping)."""
         try:
-            logging.debug(f"Stopping SSH session for {hostname}")
-            result = subprocess.run([
-                "ssh", "-O", "exit",
-                *_SSH_COMMON_OPTS,
-                "-o", f"ControlPath={self._control_path(hostname)}",
-                f"{self.username}@{hostname}"
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            logging.debug("Stopping SSH session for %s", hostname)
+            result = _run_ssh(self._exit_cmd(hostname))
             if result.returncode != 0:
-                reason = result.stderr.strip() or f"exit code {result.returncode}"
-                logging.warning(f"SSH session stop failed for {hostname}: {reason}")
+                reason = _Lazy(_ssh_error, result.stderr, result.returncode)
+                logging.warning("SSH session stop failed for %s: %s", hostname, reason)
         except Exception as e:
-            logging.warning(f"SSH session stop error for {hostname}: {e}")
+            logging.warning("SSH session stop error for %s: %s", hostname, e)
+
+    async def _exit_master_async(self, hostname: str, semaphore: asyncio.Semaphore):
+        """Asyncio counterpart of _exit_master, bounded by semaphore."""
+        try:
+            async with semaphore:
+                logging.debug("Stopping SSH session for %s", hostname)
+                proc = await asyncio.create_subprocess_exec(
+                    *self._exit_cmd(hostname),
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                )
+                _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                reason = _Lazy(_ssh_error, stderr, proc.returncode)
+                logging.warning("SSH session stop failed for %s: %s", hostname, reason)
+        except Exception as e:
+            logging.warning("SSH session stop error for %s: %s", hostname, e)
+
+    def _exit_masters(self, hostnames, max_workers: Optional[int] = None):
+        if not hostnames:
+            return
+        if max_workers is None:
+            max_workers = _default_max_workers(len(hostnames))
+
+        async def _run():
+            semaphore = asyncio.Semaphore(max_workers)
+            await asyncio.gather(*(self._exit_master_async(h, semaphore) for h in hostnames))
+
+        asyncio.run(_run())
+
+    async def _check_sockets(self, socket_paths):
+        semaphore = asyncio.Semaphore(_SOCKET_CHECK_CONCURRENCY)
+
+        async def _bounded(path):
+            async with semaphore:
+                return await _is_master_alive(path)
+
+        return await asyncio.gather(*(_bounded(p) for p in socket_paths))
 
     def cleanup_stale_sockets(self):
         """Scan for stale SSH control sockets and clean up dead ones.
@@ -90,9 +434,7 @@ class SSHSessionManager:
         Live sockets are recovered into active_sessions.
         Dead sockets are removed from disk.
         """
-        # Derive the control directory from the template
-        sample_path = self.control_path_template.replace("%r", self.username).replace("%h", "x").replace("%p", "22")
-        control_dir = os.path.dirname(sample_path)
+        control_dir = self._control_dir()
 
         if not os.path.isdir(control_dir):
             logging.info("Control socket directory does not exist: %s", control_dir)
@@ -102,100 +444,210 @@ class SSHSessionManager:
         basename_template = os.path.basename(self.control_path_template)
         prefix = basename_template.split("%")[0]  # e.g. "nlnog-"
 
-        recovered = 0
-        removed = 0
+        # Sockets unchanged since the last snapshot belong to masters that
+        # outlived a worker restart; only probe the rest.
+        snapshot = self._load_snapshot()
+        trusted = []
+        candidates = []
+        with os.scandir(control_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.startswith(prefix):
+                    continue
 
-        for entry in os.listdir(control_dir):
-            if not entry.startswith(prefix):
-                continue
+                # Parse hostname from filename format: nlnog-rise@hostname:22
+                user_host, _, _ = name[len(prefix):].rpartition(":")
+                _, at, hostname = user_host.partition("@")
+                if not at or not hostname:
+                    logging.debug("Could not parse hostname from socket file: %s", name)
+                    continue
 
-            socket_path = os.path.join(control_dir, entry)
+                if hostname in snapshot:
+                    try:
+                        if snapshot[hostname] == entry.stat(follow_symlinks=False).st_mtime_ns:
+                            trusted.append(hostname)
+                            continue
+                    except OSError:
+                        continue
+                candidates.append((hostname, entry.path))
 
-            # Parse hostname from filename format: nlnog-rise@hostname:22
-            try:
-                remainder = entry[len(prefix):]  # e.g. "rise@hostname:22"
-                at_idx = remainder.index("@")
-                colon_idx = remainder.rindex(":")
-                hostname = remainder[at_idx + 1:colon_idx]
-            except (ValueError, IndexError):
-                logging.debug("Could not parse hostname from socket file: %s", entry)
-                continue
+        # Check all masters concurrently, then apply the results in one pass
+        results = asyncio.run(self._check_sockets([path for _, path in candidates]))
 
-            # Check if the master process is alive
+        removed = 0
+        live = list(trusted)
+        for (hostname, socket_path), alive in zip(candidates, results):
+            if alive:
+                logging.info("Recovered live session from socket: %s", hostname)
+                live.append(hostname)
+                continue
+            if alive is None:
+                # Possibly a live but busy master; deleting its socket would
+                # orphan it, so leave it for the health check to settle.
+                logging.info("Could not determine state of socket for %s, leaving it", hostname)
+                continue
+            logging.debug("Removing stale socket for %s", hostname)
             try:
-                result = subprocess.run([
-                    "ssh", "-O", "check",
-                    *_SSH_COMMON_OPTS,
-                    "-o", f"ControlPath={socket_path}",
-                    f"{self.username}@{hostname}"
-                ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=5)
-
-                if result.returncode == 0:
-                    logging.info("Recovered live session from socket: %s", hostname)
-                    with self.lock:
-                        self.active_sessions.add(hostname)
-                    recovered += 1
-                else:
-                    logging.debug("Removing stale socket for %s", hostname)
-                    os.remove(socket_path)
-                    removed += 1
-            except subprocess.TimeoutExpired:
-                logging.debug("Socket check timed out for %s, removing", hostname)
-                try:
-                    os.remove(socket_path)
-                except OSError:
-                    pass
+                os.remove(socket_path)
                 removed += 1
             except OSError as e:
-                logging.warning("Error checking/removing socket %s: %s", socket_path, e)
+                logging.warning("Error removing socket %s: %s", socket_path, e)
+
+        now = time.monotonic()
+        with self.lock:
+            for hostname in live:
+                if hostname not in self.active_sessions:
+                    self._started_at[hostname] = now
+            self.active_sessions.update(dict.fromkeys(live, now))
+        recovered = len(live)
+        self._schedule_snapshot()
+
+        logging.info("Socket cleanup: %d recovered (%d from snapshot), %d stale removed",
+                     recovered, len(trusted), removed)
+
+    def refresh_stale(self, ttl: float = 300) -> List[str]:
+        """Re-probe masters not verified alive within the last `ttl` seconds.
+
+        Live masters get a fresh timestamp; dead ones are dropped from
+        active_sessions and their socket files removed, so a new master can
+        bind the path. Undetermined ones are left as they are. Returns the
+        hostnames that were dropped.
+        """
+        now = time.monotonic()
+        with self.lock:
+            stale = [h for h, t in self.active_sessions.items() if now - t > ttl]
+        if not stale:
+            return []
+
+        results = asyncio.run(self._check_sockets([self._control_path(h) for h in stale]))
+
+        dead = []
+        now = time.monotonic()
+        with self.lock:
+            for hostname, alive in zip(stale, results):
+                if hostname not in self.active_sessions:
+                    continue
+                if alive:
+                    self.active_sessions[hostname] = now
+                elif alive is False:
+                    del self.active_sessions[hostname]
+                    dead.append(hostname)
+
+        for hostname in dead:
+            try:
+                os.remove(self._control_path(hostname))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning("Error removing socket for %s: %s", hostname, e)
+
+        if dead:
+            self._schedule_snapshot()
+        logging.debug("Refreshed %d stale sessions, %d dead", len(stale), len(dead))
+        return dead
 
-        logging.info("Socket cleanup: %d recovered, %d stale removed", recovered, removed)
+    def aged_sessions(self, max_age: float, limit: int = _RECYCLE_BATCH) -> List[str]:
+        """Return up to `limit` hostnames whose master is due for recycling, oldest first.
 
-    def start_sessions_parallel(self, hostnames: Set[str], max_workers: int = 50,
+        Long-lived masters accumulate channel and mux state on both ends, so
+        they are restarted once older than `max_age` seconds. Each host's
+        limit is shortened by a stable per-host fraction (up to
+        _RECYCLE_JITTER of max_age) so masters started together at boot
+        don't all come due at once.
+        """
+        now = time.monotonic()
+        with self.lock:
+            # Entries for sessions that have since been stopped are dropped here
+            for hostname in self._started_at.keys() - self.active_sessions.keys():
+                del self._started_at[hostname]
+            aged = [
+                (t, h) for h, t in self._started_at.items()
+                if now - t > max_age * (1 - _RECYCLE_JITTER * _host_fraction(h))
+            ]
+        aged.sort()
+        return [h for _, h in aged[:limit]]
+
+    def restart_session(self, hostname: str) -> bool:
+        """Stop the master for hostname, then start a fresh one. Returns True on success."""
+        self.stop_session(hostname)
+        # The old master may unlink its socket just after acknowledging the
+        # exit; a new master can't bind the path until it is gone.
+        control_path = self._control_path(hostname)
+        deadline = time.monotonic() + 2.0
+        while os.path.exists(control_path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return self.start_session(hostname)
+
+    def start_sessions_parallel(self, hostnames: Set[str], max_workers: Optional[int] = None,
                                 progress_callback: Optional[Callable[[str, bool], None]] = None):
-        """Start SSH sessions in parallel for a set of hostnames."""
+        """Start SSH sessions in parallel for a set of hostnames.
+
+        max_workers defaults to min(max(32, CPUs * 5), number of sessions to start).
+        """
         with self.lock:
-            to_start = set(hostnames) - self.active_sessions
+            to_start = set(hostnames).difference(self.active_sessions)
 
         if not to_start:
             logging.info("All %d sessions already active", len(hostnames))
             return
 
+        if max_workers is None:
+            max_workers = _default_max_workers(len(to_start))
+
         logging.info("Starting %d SSH sessions (max_workers=%d)", len(to_start), max_workers)
+        asyncio.run(self._start_sessions_async(to_start, max_workers, progress_callback))
+
+    async def _start_sessions_async(self, to_start: Set[str], max_workers: int,
+                                    progress_callback: Optional[Callable[[str, bool], None]]):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _start(hostname):
+            return hostname, await self._start_session_async(hostname, semaphore)
+
         completed = 0
+        for next_done in asyncio.as_completed([_start(host) for host in to_start]):
+            hostname, success = await next_done
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_host = {executor.submit(self.start_session, host): host for host in sorted(to_start)}
-            for future in concurrent.futures.as_completed(future_to_host):
-                hostname = future_to_host[future]
-                try:
-                    success = future.result()
-                except Exception as e:
-                    logging.warning("Session start exception for %s: %s", hostname, e)
-                    success = False
+            completed += 1
+            if progress_callback:
+                progress_callback(hostname, success)
 
-                completed += 1
-                if progress_callback:
-                    progress_callback(hostname, success)
+            if completed % 50 == 0 or completed == len(to_start):
+                logging.info("Session startup progress: %d/%d", completed, len(to_start))
 
-                if completed % 50 == 0 or completed == len(to_start):
-                    logging.info("Session startup progress: %d/%d", completed, len(to_start))
+    def stop_sessions_parallel(self, hostnames: Set[str], max_workers: Optional[int] = None):
+        """Stop SSH sessions in parallel for a set of hostnames.
+
+        Stops only close local mux connections, so they are not rate-limited.
+        """
+        with self.lock:
+            to_stop = [h for h in hostnames if self.active_sessions.pop(h, None) is not None]
+
+        if not to_stop:
+            return
+        self._schedule_snapshot()
+        logging.info("Stopping %d SSH sessions", len(to_stop))
+        self._exit_masters(to_stop, max_workers)
 
     def sync_sessions(self, desired_hostnames: Set[str]):
         with self.lock:
-            current = self.active_sessions.copy()
-            to_add = desired_hostnames - current
-            to_remove = current - desired_hostnames
+            # Already in sync: skip the diffs and the stopper thread
+            if self.active_sessions.keys() == desired_hostnames:
+                return
+            to_add = set(desired_hostnames).difference(self.active_sessions)
+            to_remove = self.active_sessions.keys() - desired_hostnames
 
-        for host in to_add:
-            self.start_session(host)
-        for host in to_remove:
-            self.stop_session(host)
+        # Starts and stops are independent, so run both batches side by side
+        stopper = threading.Thread(target=self.stop_sessions_parallel, args=(to_remove,), daemon=True)
+        stopper.start()
+        if to_add:
+            self.start_sessions_parallel(to_add)
+        stopper.join()
 
     def cleanup(self):
         with self.lock:
             hosts = list(self.active_sessions)
-        for host in hosts:
-            self.stop_session(host)
-        with self.lock:
             self.active_sessions.clear()
+            self._started_at.clear()
+        self._exit_masters(hosts)
+        self._save_snapshot()
@@ -0,0 +1,114 @@
+import os
+import asyncio
+import logging
+import threading
+import traceback
+
+try:
+    import asyncssh
+except ImportError:  # optional dependency, only needed for PING_BACKEND=asyncssh
+    asyncssh = None
+
+from core.config import (
+    SSH_CONNECT_TIMEOUT, SSH_SUBPROCESS_TIMEOUT, SSH_KEY_PATH,
+    SSH_USERNAME, PING_COUNT, PING_TIMEOUT, DEBUG,
+)
+from core.ping import _parse_ping_result
+
+
+class AsyncSSHPool:
+    """In-process SSH connections (asyncssh), one per node, for running pings.
+
+    Each ping opens a new channel on the node's existing connection instead of
+    forking an ssh client. Connections live on a dedicated event loop thread so
+    they outlive individual /probe requests. New connections go through
+    `limiter` (the session manager's connect rate limiter) when given.
+    """
+
+    def __init__(self, limiter=None):
+        if asyncssh is None:
+            raise RuntimeError("PING_BACKEND=asyncssh requires the 'asyncssh' package")
+        self.key_path = os.path.expanduser(SSH_KEY_PATH)
+        self._limiter = limiter
+        self._conns = {}
+        self._connect_locks = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="asyncssh-pool", daemon=True)
+        self._thread.start()
+
+    async def _connection(self, node):
+        # Serialize connects per node so concurrent probes share one connection
+        lock = self._connect_locks.setdefault(node, asyncio.Lock())
+        async with lock:
+            conn = self._conns.get(node)
+            if conn is None or conn.is_closed():
+                if self._limiter is not None:
+                    await self._limiter.acquire_async()
+                try:
+                    conn = await asyncssh.connect(
+                        node, username=SSH_USERNAME, client_keys=[self.key_path],
+                        known_hosts=None, connect_timeout=SSH_CONNECT_TIMEOUT,
+                        keepalive_interval=30, keepalive_count_max=3,
+                    )
+                except Exception:
+                    if self._limiter is not None:
+                        self._limiter.backoff()
+                    raise
+                self._conns[node] = conn
+            return conn
+
+    async def _ping(self, node, target):
+        logging.debug(f"Running asyncssh ping from {node} to {target}")
+        try:
+            conn = await self._connection(node)
+            result = await conn.run(
+                f"ping -c{PING_COUNT} -W{PING_TIMEOUT} {target}",
+                stderr=asyncssh.STDOUT, timeout=SSH_SUBPROCESS_TIMEOUT,
+            )
+            return _parse_ping_result(node, result.exit_status, result.stdout)
+        except (asyncssh.TimeoutError, asyncio.TimeoutError):
+            logging.warning(f"SSH to {node} timed out")
+            return node, "ssh_timeout", None
+        except Exception as e:
+            logging.error(f"Error pinging from {node}: {e}")
+            if DEBUG:
+                traceback.print_exc()
+            # Drop the connection so the next probe reconnects
+            conn = self._conns.pop(node, None)
+            if conn is not None:
+                conn.close()
+            return node, "exception", None
+
+    async def _ping_all(self, nodes, target, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(node):
+            async with semaphore:
+                return await self._ping(node, target)
+
+        return await asyncio.gather(*(_bounded(n) for n in nodes), return_exceptions=True)
+
+    def ping_nodes(self, nodes, target, concurrency):
+        """Blocking counterpart of core.ping.ping_nodes_async using pooled connections."""
+        future = asyncio.run_coroutine_threadsafe(self._ping_all(nodes, target, concurrency), self._loop)
+        return future.result()
+
+    def prune(self, nodes):
+        """Close connections to hosts that are no longer in `nodes`."""
+        async def _prune():
+            for node in self._conns.keys() - nodes:
+                self._conns.pop(node).close()
+            for node in self._connect_locks.keys() - nodes:
+                del self._connect_locks[node]
+
+        asyncio.run_coroutine_threadsafe(_prune(), self._loop).result()
+
+    def close(self):
+        """Close all connections and stop the event loop."""
+        async def _close_all():
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+
+        asyncio.run_coroutine_threadsafe(_close_all(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -3,7 +3,10 @@ import os
 
 bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '8000')}"
 workers = 1          # Required: app uses in-process shared state
-threads = 4          # Concurrent request handling
+# Concurrent requests; each /probe waits on one asyncio loop. Every probe opens
+# one session per node on that node's single SSH master, and sshd's default
+# MaxSessions is 10 per connection, so keep this below 10.
+threads = 8
 worker_class = "gthread"
 timeout = 120        # /probe can take ~15s per node
 accesslog = "-"
@@ -65,3 +68,6 @@ def worker_exit(server, worker):
         node_manager.shutdown_event.set()
         node_manager.ssh_sessions.cleanup()
         logging.info("SSH session cleanup complete")
+    ssh_pool = app.config.get("ssh_pool")
+    if ssh_pool:
+        ssh_pool.close()